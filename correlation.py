@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+
+# ----- Rolling cross-asset correlation -----
+# Keeps running sums over a window of returns so that the full N x N correlation
+# matrix is one BLAS matrix product per update, with no per-pair Python loop.
+# Series are sampled on one calendar; a bar missing inside it (a holiday on one
+# exchange, a late listing) counts as a zero return, i.e. the price is carried
+# forward.
+
+
+def aligned_returns(prices, calendar=None):
+    # Date x Symbol close panel -> log returns. Without a calendar the union of
+    # all dates is used. With one (e.g. stock trading days) every series is
+    # sampled at its last price on or before each calendar date, so 24/7 assets
+    # compound their weekend moves into the next session's return instead of
+    # showing moves on days where the stocks sit at an artificial zero.
+    prices = prices.sort_index().ffill()
+    if calendar is not None:
+        calendar = pd.DatetimeIndex(calendar).unique().sort_values()
+        prices = prices.reindex(calendar, method="ffill")
+    prices = prices.where(prices > 0)
+    returns = np.log(prices).diff().iloc[1:]
+    return returns.fillna(0.0)
+
+
+class RollingCorrelation:
+    def __init__(self, symbols, window=60, refresh_every=None):
+        self.symbols = list(symbols)
+        self.window = window
+        # Rebuild the sums from the buffer now and then to stop float drift
+        self.refresh_every = refresh_every or window
+        n = len(self.symbols)
+        self._buffer = np.zeros((window, n))
+        self._pos = 0
+        self._count = 0
+        self._since_refresh = 0
+        self._sum = np.zeros(n)
+        self._cross = np.zeros((n, n))
+
+    @property
+    def ready(self):
+        return self._count >= 2
+
+    def update(self, returns):
+        # returns: (k, N) array or DataFrame of new bars, oldest first
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.symbols).fillna(0.0).to_numpy()
+        block = np.nan_to_num(np.atleast_2d(np.asarray(returns, dtype=float)))
+        if len(block) > self.window:
+            block = block[-self.window:]
+        k = len(block)
+        if k == 0:
+            return self
+
+        # Slots about to be overwritten hold the oldest bars (or zeros while the
+        # window is still filling, which subtract nothing)
+        slots = (self._pos + np.arange(k)) % self.window
+        leaving = self._buffer[slots]
+
+        self._sum += block.sum(axis=0) - leaving.sum(axis=0)
+        self._cross += block.T @ block - leaving.T @ leaving
+
+        self._buffer[slots] = block
+        self._pos = (self._pos + k) % self.window
+        self._count = min(self._count + k, self.window)
+        self._since_refresh += k
+        if self._since_refresh >= self.refresh_every:
+            self._recompute()
+        return self
+
+    def _recompute(self):
+        self._sum = self._buffer.sum(axis=0)
+        self._cross = self._buffer.T @ self._buffer
+        self._since_refresh = 0
+
+    def matrix(self):
+        n = self._count
+        if n < 2:
+            return np.full((len(self.symbols), len(self.symbols)), np.nan)
+        mean = self._sum / n
+        cov = (self._cross - n * np.outer(mean, mean)) / (n - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0.0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        corr[~np.isfinite(corr)] = np.nan
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return corr
+
+    def frame(self):
+        return pd.DataFrame(self.matrix(), index=self.symbols, columns=self.symbols)
+
+
+def top_pairs(scores, symbols, k=20, largest=True):
+    # Best k entries of the upper triangle of an N x N score matrix
+    scores = np.array(scores, dtype=float)
+    n = len(symbols)
+    fill = -np.inf if largest else np.inf
+    scores[np.tril_indices(n)] = fill
+    scores[np.isnan(scores)] = fill
+    flat = scores.ravel() if largest else -scores.ravel()
+    k = min(k, n * (n - 1) // 2)
+    if k <= 0:
+        return []
+    idx = np.argpartition(flat, -k)[-k:]
+    idx = idx[np.argsort(flat[idx])[::-1]]
+    idx = idx[np.isfinite(flat[idx])]
+    rows, cols = np.unravel_index(idx, scores.shape)
+    return [(symbols[i], symbols[j], float(scores[i, j])) for i, j in zip(rows, cols)]
+
+
+class PairScanner:
+    # Pairs that are usually correlated (long window) but have come apart lately
+    # (short window) are the diverging ones.
+    def __init__(self, symbols, long_window=120, short_window=20):
+        self.symbols = list(symbols)
+        self.long = RollingCorrelation(self.symbols, window=long_window)
+        self.short = RollingCorrelation(self.symbols, window=short_window)
+
+    def update(self, returns):
+        self.long.update(returns)
+        self.short.update(returns)
+        return self
+
+    def correlated(self, k=20):
+        return self._pairs(self.long.matrix(), k, "Correlation")
+
+    def diverging(self, k=20, min_long_corr=0.5):
+        long_corr = self.long.matrix()
+        short_corr = self.short.matrix()
+        divergence = long_corr - short_corr
+        divergence[long_corr < min_long_corr] = np.nan
+        pairs = self._pairs(divergence, k, "Divergence")
+        if not pairs.empty:
+            index = {symbol: i for i, symbol in enumerate(self.symbols)}
+            i = pairs["A"].map(index).to_numpy()
+            j = pairs["B"].map(index).to_numpy()
+            pairs["Long Corr"] = long_corr[i, j]
+            pairs["Short Corr"] = short_corr[i, j]
+        return pairs
+
+    def _pairs(self, scores, k, label):
+        return pd.DataFrame(top_pairs(scores, self.symbols, k=k), columns=["A", "B", label])
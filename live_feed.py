@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pandas as pd
+import yfinance as yf
+
+# ----- Live 1m bar feed -----
+# A background thread runs an asyncio loop that polls every ticker concurrently
+# and appends only the bars newer than what it already holds. The Streamlit
+# page just reads snapshot() on its own refresh interval. Polling pauses when
+# nobody has read a snapshot for a few intervals and resumes on the next read.
+
+logger = logging.getLogger(__name__)
+
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class CommodityFeed:
+    def __init__(self, tickers, poll_seconds=15, max_bars=500, idle_after=None):
+        self.tickers = list(dict.fromkeys(tickers))
+        self.poll_seconds = poll_seconds
+        self.idle_after = idle_after or 4 * poll_seconds
+        self.max_bars = max_bars  # rolling buffer keeps per-update CPU flat
+        self._bars = {}
+        self._last_success = {}  # ticker -> time of its last successful fetch
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._last_read = time.monotonic()
+        self._thread = None
+
+    def start(self):
+        # Safe to call on every read: also revives the thread if it ever died
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="commodity-feed", daemon=True)
+                self._thread.start()
+        return self
+
+    def snapshot(self):
+        # Buffers are replaced, never mutated, so a shallow copy is a consistent view
+        with self._lock:
+            if self._idle():
+                self._wake.set()  # someone is watching again: poll right away
+            self._last_read = time.monotonic()
+            return dict(self._bars), dict(self._last_success)
+
+    def request_poll(self):
+        self._wake.set()
+
+    def _idle(self):
+        return time.monotonic() - self._last_read > self.idle_after
+
+    def _run(self):
+        asyncio.run(self._poll_loop())
+
+    async def _poll_loop(self):
+        while True:
+            try:
+                results = await asyncio.gather(
+                    *(self._poll(ticker) for ticker in self.tickers), return_exceptions=True
+                )
+                for ticker, result in zip(self.tickers, results):
+                    if isinstance(result, BaseException):
+                        logger.warning("Commodity feed: polling %s failed: %r", ticker, result)
+            except Exception:
+                logger.exception("Commodity feed: poll round failed")
+            await self._wait_for_next_round()
+
+    async def _wait_for_next_round(self):
+        # Next tick, an explicit request_poll(), or - while idle - the next read
+        deadline = time.monotonic() + self.poll_seconds
+        while not self._wake.is_set() and (time.monotonic() < deadline or self._idle()):
+            await asyncio.sleep(0.5)
+        self._wake.clear()
+
+    async def _poll(self, ticker):
+        with self._lock:
+            current = self._bars.get(ticker)
+
+        if current is None or current.empty:
+            delta = await asyncio.to_thread(self._fetch, ticker, None)
+        else:
+            # Re-request the last bar too: it is still forming until the minute closes
+            delta = await asyncio.to_thread(self._fetch, ticker, current.index[-1])
+
+        # history() logs most Yahoo errors and returns an empty frame instead of
+        # raising. The delta request re-asks for the last bar, so a healthy
+        # fetch is never empty: treat empty as a failure and leave the ticker stale.
+        if delta.empty:
+            raise RuntimeError(f"no bars returned for {ticker}")
+
+        if current is not None and not current.empty:
+            merged = pd.concat([current[current.index < delta.index[0]], delta])
+        else:
+            merged = delta
+        merged = merged[~merged.index.duplicated(keep="last")].iloc[-self.max_bars:]
+
+        with self._lock:
+            self._bars[ticker] = merged
+            self._last_success[ticker] = pd.Timestamp.now(tz="UTC")
+
+    @staticmethod
+    def _fetch(ticker, since):
+        # Ticker.history is safe to call from several threads, unlike yf.download
+        if since is None:
+            data = yf.Ticker(ticker).history(period="1d", interval="1m")
+        else:
+            data = yf.Ticker(ticker).history(start=since, interval="1m")
+        if since is not None and not data.empty:
+            data = data[data.index >= since]
+        if data.empty:
+            return data
+        return data[[col for col in BAR_COLUMNS if col in data.columns]].sort_index()
@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+# ----- Portfolio sizing and risk -----
+# Sizes every Buy signal together (instead of a flat 25% each) and estimates
+# the risk of the resulting book by bootstrapping historical daily returns.
+
+
+def _cap_weights(raw, max_position, max_gross):
+    # Scale raw scores to max_gross, then clip at max_position and hand the
+    # excess to the uncapped names until nothing is over the limit
+    weights = np.zeros_like(raw)
+    free = raw > 0
+    budget = max_gross
+    while free.any() and budget > 1e-12:
+        share = raw[free] / raw[free].sum() * budget
+        over = share > max_position
+        if not over.any():
+            weights[free] = share
+            break
+        capped = np.flatnonzero(free)[over]
+        weights[capped] = max_position
+        free[capped] = False
+        budget = max_gross - weights.sum()
+    return weights
+
+
+def allocate(signals, prices, returns, capital, max_position=0.25, max_gross=1.0, lookback=60):
+    # signals/prices: {ticker: value}; returns: Date x Ticker daily returns.
+    # Buys get inverse-volatility weights, shrunk for names that move with the
+    # other Buys, then capped per position and in total.
+    buys = [t for t, s in signals.items() if s == "Buy" and t in returns.columns and prices.get(t)]
+    columns = ["Ticker", "Weight", "Position (£)", "Quantity", "Volatility"]
+    if not buys:
+        return pd.DataFrame(columns=columns)
+
+    window = returns[buys].tail(lookback)
+    vol = window.std().to_numpy()
+    vol = np.where(np.isfinite(vol) & (vol > 0), vol, np.nanmax(np.append(vol, 1e-4)))
+    if len(buys) > 1:
+        corr = np.nan_to_num(window.corr().to_numpy())
+        np.fill_diagonal(corr, 0.0)
+        crowding = np.clip(corr, 0.0, None).sum(axis=1) / (len(buys) - 1)
+    else:
+        crowding = np.zeros(1)
+    raw = 1.0 / (vol * (1.0 + crowding))
+
+    weights = _cap_weights(raw, max_position, max_gross)
+    position = weights * capital
+    price = np.array([prices[t] for t in buys], dtype=float)
+    book = pd.DataFrame({
+        "Ticker": buys,
+        "Weight": weights,
+        "Position (£)": position,
+        "Quantity": position / price,
+        "Volatility": vol,
+    }, columns=columns)
+    return book.sort_values("Weight", ascending=False, ignore_index=True)
+
+
+def simulate(returns, weights, capital, horizon=20, paths=10000, seed=None):
+    # Bootstrap whole days of history (keeps the cross-asset correlation) for a
+    # fixed-weight book. Because weights are fixed, the book's daily return is
+    # computed once and only that 1-D series is resampled: paths x horizon.
+    returns = np.nan_to_num(np.asarray(returns, dtype=float))
+    book_returns = returns @ np.asarray(weights, dtype=float)
+    if len(book_returns) == 0:
+        raise ValueError("No return history to simulate from")
+
+    rng = np.random.default_rng(seed)
+    draws = book_returns[rng.integers(0, len(book_returns), size=(paths, horizon))]
+    equity = capital * np.cumprod(1.0 + draws, axis=1)
+    pnl = equity[:, -1] - capital
+
+    peak = np.maximum.accumulate(np.concatenate([np.full((paths, 1), capital), equity], axis=1), axis=1)[:, 1:]
+    max_drawdown = (1.0 - equity / peak).max(axis=1)
+
+    var_95, var_99 = -np.percentile(pnl, [5, 1])
+    tail = pnl[pnl <= -var_95]
+    return {
+        "Expected P&L": float(pnl.mean()),
+        "VaR 95%": float(var_95),
+        "VaR 99%": float(var_99),
+        "CVaR 95%": float(-tail.mean()) if len(tail) else float(var_95),
+        "Median Max Drawdown": float(np.median(max_drawdown)),
+        "95th pct Max Drawdown": float(np.percentile(max_drawdown, 95)),
+    }
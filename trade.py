@@ -4,6 +4,14 @@ import pandas as pd
 import numpy as np
 import altair as alt
 import requests
+import threading
+import time
+
+from correlation import PairScanner, aligned_returns
+from live_feed import CommodityFeed
+from portfolio import allocate, simulate
+from universe import company_dict, crypto_dict, commodity_tickers
+from warehouse import read_close_panel
 
 # ----- Helper functions -----
 def calculate_rsi(data, window=14):
@@ -145,18 +153,196 @@ def get_crypto_data(coin_id, days=60):
     df.drop("Timestamp", axis=1, inplace=True)
     return df
 
-# Safe formatting functions
-def safe_currency_format(x):
-    try:
-        return f"${x:,.2f}"
-    except (ValueError, TypeError):
-        return ""
+# ----- Table column formats -----
+# Declared per column and applied in the browser: the data stays numeric (so
+# client-side sorting and search work) and goes to the frontend as plain Arrow,
+# with no per-cell Python formatting or HTML Styler.
+def number_columns(fmt, *names):
+    return {name: st.column_config.NumberColumn(name, format=fmt) for name in names}
 
-def safe_float_format(x):
-    try:
-        return f"{x:.2f}"
-    except (ValueError, TypeError):
-        return ""
+SUMMARY_COLUMNS = {
+    **number_columns("$%.2f", "Current Price", "SMA(20)", "EMA(20)"),
+    **number_columns("%.2f", "RSI"),
+}
+
+COMMODITY_COLUMNS = {
+    **number_columns("£%.2f", "Current Price", "EMA(5)", "SMA(5)"),
+    **number_columns("%.2f", "RSI(7)"),
+    "Updated": st.column_config.DatetimeColumn("Updated", format="HH:mm:ss"),
+}
+
+def as_numeric(df, column_config):
+    # Coerce the formatted columns once, vectorized, instead of guarding every cell
+    cols = [col for col in column_config if col in df.columns]
+    if cols:
+        df[cols] = df[cols].apply(pd.to_numeric, errors="coerce")
+    return df
+
+BOOK_COLUMNS = {
+    "Weight": st.column_config.NumberColumn("Weight", format="%.1f%%"),
+    **number_columns("£%.2f", "Position (£)"),
+    **number_columns("%.2f", "Quantity"),
+    **number_columns("%.4f", "Volatility"),
+}
+
+PAIR_COLUMNS = number_columns("%.3f", "Correlation", "Divergence", "Long Corr", "Short Corr")
+
+# ----- Live commodity board -----
+COMMODITY_POLL_SECONDS = 15
+
+@st.cache_resource
+def get_commodity_feed():
+    # One polling loop per server process, shared by every session
+    return CommodityFeed(commodity_tickers.values(), poll_seconds=COMMODITY_POLL_SECONDS).start()
+
+def commodity_row(name, data):
+    data = data.copy()  # feed buffers are shared, never mutate them
+    rsi = calculate_rsi(data)
+    sma = calculate_sma(data, window=5)
+    ema = calculate_ema(data, window=5)
+    macd, macd_signal = calculate_macd(data)
+
+    data['RSI'] = rsi
+    data['SMA'] = sma
+    data['EMA'] = ema
+    data['MACD'] = macd
+    data['MACD Signal'] = macd_signal
+
+    signal = fast_commodity_signal(data)
+    price = float(data['Close'].dropna().iloc[-1])
+
+    return {
+        "Commodity": name,
+        "Current Price": price,
+        "RSI(7)": round(float(rsi.dropna().iloc[-1]), 2),
+        "EMA(5)": round(float(ema.dropna().iloc[-1]), 2),
+        "SMA(5)": round(float(sma.dropna().iloc[-1]), 2),
+        "Signal": signal
+    }
+
+@st.fragment(run_every=COMMODITY_POLL_SECONDS)
+def commodity_board(selected_commodities):
+    # Widgets inside a fragment only re-run the fragment, not the whole page
+    feed = get_commodity_feed().start()  # start() also restarts a dead poller
+    if st.button("🔄 Refresh Data"):
+        feed.request_poll()
+        st.toast("Fetching latest bars…")
+    bars, last_success = feed.snapshot()
+    now = pd.Timestamp.now(tz="UTC")
+    stale_after = pd.Timedelta(seconds=3 * COMMODITY_POLL_SECONDS)
+
+    rows = []
+    for name in selected_commodities:
+        ticker = commodity_tickers[name]
+        data = bars.get(ticker)
+        if data is None or data.empty:
+            continue
+        try:
+            row = commodity_row(name, data)
+        except IndexError:
+            continue  # not enough bars yet for the indicators
+        updated = last_success.get(ticker)
+        row["Updated"] = updated.tz_localize(None) if updated is not None else None
+        row["Status"] = "Live" if updated is not None and now - updated <= stale_after else "⚠️ Stale"
+        rows.append(row)
+
+    df = pd.DataFrame(rows)
+
+    st.subheader("📊 Live Speed Trading Signals")
+    if df.empty:
+        st.info("⏳ Waiting for the first bars…")
+        return
+    stale = int((df["Status"] != "Live").sum())
+    if stale:
+        st.warning(f"⚠️ {stale} commodities have not updated in over {stale_after.seconds}s – their prices may be out of date.")
+    st.caption(f"Times in UTC, refreshes every {COMMODITY_POLL_SECONDS}s")
+
+    st.dataframe(df, column_config=COMMODITY_COLUMNS, hide_index=True)
+
+# ----- Cross-asset pairs -----
+COINGECKO_PAUSE_SECONDS = 1.5
+COINGECKO_RETRIES = 2
+
+def get_crypto_data_with_retry(coin_id, days=60):
+    # CoinGecko answers rate-limited requests without "prices", which
+    # get_crypto_data turns into an empty frame: back off and try again
+    for attempt in range(COINGECKO_RETRIES + 1):
+        try:
+            df = get_crypto_data(coin_id, days=days)
+        except (requests.RequestException, ValueError):
+            df = pd.DataFrame()
+        if not df.empty or attempt == COINGECKO_RETRIES:
+            return df
+        time.sleep(5 * (attempt + 1))
+
+@st.cache_data(ttl=3600, show_spinner="Downloading price history…")
+def load_close_panel(tickers, coin_names, days=365):
+    # Date x Symbol closes for yfinance tickers and CoinGecko coins, aligned by day
+    columns = {}
+    if tickers:
+        data = yf.download(list(tickers), period=f"{days}d", interval="1d", progress=False)
+        if not data.empty:
+            closes = data['Close']
+            if isinstance(closes, pd.Series):
+                closes = closes.to_frame(tickers[0])
+            for ticker in closes.columns:
+                columns[ticker] = closes[ticker]
+    for i, coin_name in enumerate(coin_names):
+        if i:
+            time.sleep(COINGECKO_PAUSE_SECONDS)  # stay under the free-tier rate limit
+        df = get_crypto_data_with_retry(crypto_dict[coin_name], days=days)
+        if not df.empty:
+            columns[coin_name] = df['Close']
+
+    panel = pd.DataFrame({
+        name: series.groupby(pd.DatetimeIndex(series.index).tz_localize(None).normalize()).last()
+        for name, series in columns.items()
+    })
+    panel = panel.dropna(axis=1, how="all").sort_index()
+    dropped = [name for name in list(tickers) + list(coin_names) if name not in panel.columns]
+    return panel, dropped
+
+@st.cache_resource(max_entries=4)
+def get_pair_scanner(symbols, long_window, short_window):
+    # Survives reruns and is shared by sessions; only rows newer than
+    # fed_until are pushed into it, so each refresh costs just the delta.
+    # Keyed on the requested universe, not on whatever downloaded this hour.
+    return {
+        "scanner": PairScanner(symbols, long_window=long_window, short_window=short_window),
+        "fed_until": None,
+        "lock": threading.Lock(),
+    }
+
+# ----- Portfolio risk history -----
+RISK_HISTORY_YEARS = 2
+
+@st.cache_data(ttl=3600, show_spinner="Loading return history…")
+def load_risk_returns(tickers, years=RISK_HISTORY_YEARS):
+    # Daily returns for the Monte Carlo: the local warehouse when it has been
+    # backfilled far enough, a batch download for everything else
+    start = pd.Timestamp.now().normalize() - pd.DateOffset(years=years)
+    closes = read_close_panel(list(tickers), start=start)
+    min_rows = 200 * years  # ~250 trading days a year, allow for gaps
+    # A warehouse series must also reach the present (a long weekend or
+    # holiday at most), otherwise recent returns would silently be missing
+    fresh_since = pd.Timestamp.now().normalize() - pd.Timedelta(days=5)
+    have = [
+        t for t in closes.columns
+        if closes[t].count() >= min_rows and closes[t].last_valid_index() >= fresh_since
+    ]
+    missing = [t for t in tickers if t not in have]
+    columns = {t: closes[t] for t in have}
+    if missing:
+        data = yf.download(missing, period=f"{years}y", interval="1d", progress=False)
+        if not data.empty:
+            downloaded = data['Close']
+            if isinstance(downloaded, pd.Series):
+                downloaded = downloaded.to_frame(missing[0])
+            for ticker in downloaded.columns:
+                columns[ticker] = downloaded[ticker]
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame(columns).sort_index().pct_change(fill_method=None).iloc[1:]
 
 # ----- Login Screen -----
 st.title("Login")
@@ -166,308 +352,12 @@ if password != "2121":
 
 # Sidebar Page Selector
 st.sidebar.title("Navigation")
-page = st.sidebar.selectbox("Go to", ["Commodity", "Stocks", "Crypto", "Summary"])
-
-company_dict = {
-    # Tech & IT
-    "Apple (AAPL)": "AAPL",
-    "Tesla (TSLA)": "TSLA",
-    "Microsoft (MSFT)": "MSFT",
-    "Google (GOOGL)": "GOOGL",
-    "Amazon (AMZN)": "AMZN",
-    "NVIDIA (NVDA)": "NVDA",
-    "Meta (META)": "META",
-    "Netflix (NFLX)": "NFLX",
-    "AMD (AMD)": "AMD",
-    "PayPal (PYPL)": "PYPL",
-    "Visa (V)": "V",
-    "Mastercard (MA)": "MA",
-    "Intel (INTC)": "INTC",
-    "Salesforce (CRM)": "CRM",
-    "Adobe (ADBE)": "ADBE",
-    "Oracle (ORCL)": "ORCL",
-    "Cisco (CSCO)": "CSCO",
-    "Qualcomm (QCOM)": "QCOM",
-    "IBM (IBM)": "IBM",
-    "Snap (SNAP)": "SNAP",
-    "eBay (EBAY)": "EBAY",
-    "Twitter (TWTR)": "TWTR",
-    "Zoom (ZM)": "ZM",
-    "Shopify (SHOP)": "SHOP",
-    "Snowflake (SNOW)": "SNOW",
-    "Palantir (PLTR)": "PLTR",
-    "Dropbox (DBX)": "DBX",
-    
-    # Consumer Goods
-    "Coca-Cola (KO)": "KO",
-    "PepsiCo (PEP)": "PEP",
-    "Procter & Gamble (PG)": "PG",
-    "McDonald's (MCD)": "MCD",
-    "Nike (NKE)": "NKE",
-    "Starbucks (SBUX)": "SBUX",
-    "Costco (COST)": "COST",
-    "Colgate-Palmolive (CL)": "CL",
-    "Mondelez (MDLZ)": "MDLZ",
-    "Kraft Heinz (KHC)": "KHC",
-    "General Mills (GIS)": "GIS",
-    "L'Oreal (OR)": "OR",
-    "Unilever (UL)": "UL",
-    "Nestle (NSRGY)": "NSRGY",
-    "Kimberly-Clark (KMB)": "KMB",
-    "Estee Lauder (EL)": "EL",
-    
-    # Finance & Banks
-    "JPMorgan Chase (JPM)": "JPM",
-    "Goldman Sachs (GS)": "GS",
-    "Morgan Stanley (MS)": "MS",
-    "Bank of America (BAC)": "BAC",
-    "Citigroup (C)": "C",
-    "Wells Fargo (WFC)": "WFC",
-    "American Express (AXP)": "AXP",
-    "Visa (V)": "V",
-    "Mastercard (MA)": "MA",
-    "Charles Schwab (SCHW)": "SCHW",
-    
-    # Healthcare & Pharma
-    "Johnson & Johnson (JNJ)": "JNJ",
-    "AbbVie (ABBV)": "ABBV",
-    "Pfizer (PFE)": "PFE",
-    "Merck (MRK)": "MRK",
-    "Moderna (MRNA)": "MRNA",
-    "Gilead Sciences (GILD)": "GILD",
-    "Bristol-Myers Squibb (BMY)": "BMY",
-    "Eli Lilly (LLY)": "LLY",
-    "Amgen (AMGN)": "AMGN",
-    "Biogen (BIIB)": "BIIB",
-    
-    # Energy & Industrials
-    "ExxonMobil (XOM)": "XOM",
-    "Chevron (CVX)": "CVX",
-    "ConocoPhillips (COP)": "COP",
-    "Schlumberger (SLB)": "SLB",
-    "Boeing (BA)": "BA",
-    "Caterpillar (CAT)": "CAT",
-    "3M (MMM)": "MMM",
-    "Honeywell (HON)": "HON",
-    "General Electric (GE)": "GE",
-    "Lockheed Martin (LMT)": "LMT",
-    "Raytheon (RTX)": "RTX",
-    "FedEx (FDX)": "FDX",
-    "United Parcel Service (UPS)": "UPS",
-    
-    # Telecom
-    "Verizon (VZ)": "VZ",
-    "AT&T (T)": "T",
-    "T-Mobile (TMUS)": "TMUS",
-    
-    # Retail
-    "Walmart (WMT)": "WMT",
-    "Target (TGT)": "TGT",
-    "Lowe's (LOW)": "LOW",
-    "Home Depot (HD)": "HD",
-    "Dollar General (DG)": "DG",
-    
-    # Automotive
-    "Ford (F)": "F",
-    "General Motors (GM)": "GM",
-    "Toyota (TM)": "TM",
-    "Honda (HMC)": "HMC",
-    "Tesla (TSLA)": "TSLA",
-    
-    # Others & Misc
-    "Disney (DIS)": "DIS",
-    "Booking Holdings (BKNG)": "BKNG",
-    "Airbnb (ABNB)": "ABNB",
-    "Uber (UBER)": "UBER",
-    "Lyft (LYFT)": "LYFT",
-    "Netflix (NFLX)": "NFLX",
-    "Spotify (SPOT)": "SPOT",
-    "Zoom Video (ZM)": "ZM",
-    "Slack (WORK)": "WORK",
-    "Intel (INTC)": "INTC",
-    
-    # International Large Caps
-    "Samsung (005930.KS)": "005930.KS",
-    "Alibaba (BABA)": "BABA",
-    "BHP Group (BHP)": "BHP",
-    "Toyota (TM)": "TM",
-    "Shell (SHEL)": "SHEL",
-    "Siemens (SIE.DE)": "SIE.DE",
-    "Nestle (NSRGY)": "NSRGY",
-    "Novartis (NVS)": "NVS",
-    "Roche (RHHBY)": "RHHBY",
-    "Sony (SONY)": "SONY",
-    
-    # Additional Popular US Stocks
-    "Twitter (TWTR)": "TWTR",
-    "Square (SQ)": "SQ",
-    "Intel (INTC)": "INTC",
-    "Dropbox (DBX)": "DBX",
-    "eBay (EBAY)": "EBAY",
-    "Zillow (Z)": "Z",
-    "Peloton (PTON)": "PTON",
-    "Wayfair (W)": "W",
-    "Xilinx (XLNX)": "XLNX",
-    "Western Digital (WDC)": "WDC",
-    
-    # More Big Names
-    "Twitter (TWTR)": "TWTR",
-    "Facebook (META)": "META",
-    "Zoom Video (ZM)": "ZM",
-    "Slack (WORK)": "WORK",
-    "Pinterest (PINS)": "PINS",
-    "Square (SQ)": "SQ",
-    "Shopify (SHOP)": "SHOP",
-    "Atlassian (TEAM)": "TEAM",
-    "DocuSign (DOCU)": "DOCU",
-    "CrowdStrike (CRWD)": "CRWD",
-
-    # Additional Tech & IT
-    "ZoomInfo Technologies (ZI)": "ZI",
-    "Snowflake Inc. (SNOW)": "SNOW",
-    "Datadog (DDOG)": "DDOG",
-    "Twilio (TWLO)": "TWLO",
-    "Workday (WDAY)": "WDAY",
-    "ServiceNow (NOW)": "NOW",
-    "CrowdStrike (CRWD)": "CRWD",
-    "Okta (OKTA)": "OKTA",
-    "Atlassian (TEAM)": "TEAM",
-
-    # More Consumer Goods
-    "Clorox (CLX)": "CLX",
-    "Church & Dwight (CHD)": "CHD",
-    "Dollar Tree (DLTR)": "DLTR",
-    "Hasbro (HAS)": "HAS",
-
-    # More Finance & Banks
-    "BlackRock (BLK)": "BLK",
-    "Visa Europe (V)": "V",
-    "American International Group (AIG)": "AIG",
-    "CME Group (CME)": "CME",
-
-    # More Healthcare & Pharma
-    "Regeneron Pharmaceuticals (REGN)": "REGN",
-    "Vertex Pharmaceuticals (VRTX)": "VRTX",
-    "Novo Nordisk (NVO)": "NVO",
-    "Sanofi (SNY)": "SNY",
-
-    # Energy & Industrials
-    "NextEra Energy (NEE)": "NEE",
-    "Dominion Energy (D)": "D",
-    "Deere & Company (DE)": "DE",
-    "Eaton Corporation (ETN)": "ETN",
-    "Tesla (TSLA)": "TSLA",
-
-    # Telecom & Media
-    "Comcast (CMCSA)": "CMCSA",
-    "Charter Communications (CHTR)": "CHTR",
-    "Spotify (SPOT)": "SPOT",
-
-    # International
-    "Tencent Holdings (0700.HK)": "0700.HK",
-    "Baidu (BIDU)": "BIDU",
-    "SAP (SAP)": "SAP",
-    "Volkswagen (VWAGY)": "VWAGY",
-    "LVMH (LVMUY)": "LVMUY",
-
-    # Consumer Services / Travel
-    "Expedia Group (EXPE)": "EXPE",
-    "Carnival Corporation (CCL)": "CCL",
-    "Marriott International (MAR)": "MAR",
-
-    # Real Estate & REITs
-    "Prologis (PLD)": "PLD",
-    "American Tower (AMT)": "AMT",
-    "Digital Realty (DLR)": "DLR",
-
-    # Others
-    "Adobe (ADBE)": "ADBE",
-    "NVIDIA (NVDA)": "NVDA",
-    "Micron Technology (MU)": "MU",
-    "Square (SQ)": "SQ",
-    "Pinterest (PINS)": "PINS",
-    
-}
+page = st.sidebar.selectbox("Go to", ["Commodity", "Stocks", "Crypto", "Summary", "Pairs"])
 
-# Expanded Crypto Dictionary (50 popular cryptocurrencies)
-crypto_dict = {
-    "Bitcoin": "bitcoin",
-    "Ethereum": "ethereum",
-    "Binance Coin": "binancecoin",
-    "Cardano": "cardano",
-    "Dogecoin": "dogecoin",
-    "Solana": "solana",
-    "Polkadot": "polkadot",
-    "Ripple": "ripple",
-    "Litecoin": "litecoin",
-    "Avalanche": "avalanche-2",
-    "Shiba Inu": "shiba-inu",
-    "Chainlink": "chainlink",
-    "Polygon": "matic-network",
-    "Stellar": "stellar",
-    "VeChain": "vechain",
-    "Tron": "tron",
-    "EOS": "eos",
-    "Monero": "monero",
-    "Algorand": "algorand",
-    "Tezos": "tezos",
-    "Cosmos": "cosmos",
-    "Filecoin": "filecoin",
-    "Bitcoin Cash": "bitcoin-cash",
-    "NEO": "neo",
-    "IOTA": "iota",
-    "Dash": "dash",
-    "Zcash": "zcash",
-    "Maker": "maker",
-    "Kusama": "kusama",
-    "Theta Network": "theta-token",
-    "Elrond": "elrond-erd-2",
-    "Compound": "compound-governance-token",
-    "Aave": "aave",
-    "SushiSwap": "sushi",
-    "Yearn Finance": "yearn-finance",
-    "Terra": "terra-luna",
-    "Fantom": "fantom",
-    "Harmony": "harmony",
-    "Hedera": "hedera-hashgraph",
-    "Celo": "celo",
-    "Enjin Coin": "enjincoin",
-    "Basic Attention Token": "basic-attention-token",
-    "Decentraland": "decentraland",
-    "The Graph": "the-graph",
-    "Loopring": "loopring",
-    "Bitcoin SV": "bitcoin-cash-sv",
-    "Qtum": "qtum",
-    "Zilliqa": "zilliqa",
-    "Waves": "waves"
-}
 if page == "Commodity":
     # --- UI Starts Here ---
     st.title("Commodity (Speed Trading)")
-    if st.button("🔄 Refresh Data"):
-        st.rerun()
 
-    commodity_tickers = {
-    "Gold (XAU/USD)": "GC=F",
-    "Silver (XAG/USD)": "SI=F",
-    "Crude Oil (WTI)": "CL=F",
-    "Brent Oil": "BZ=F",
-    "Natural Gas": "NG=F",
-    "Platinum": "PL=F",
-    "Copper": "HG=F",
-    "Heating Oil": "HO=F",
-    "Gasoline (RBOB)": "RB=F",
-    "Soybeans": "ZS=F",
-    "Corn": "ZC=F",
-    "Wheat": "ZW=F",
-    "Cotton": "CT=F",
-    "Coffee": "KC=F",
-    "Sugar": "SB=F",
-    "Cocoa": "CC=F",
-    "Live Cattle": "LE=F",
-    "Lean Hogs": "HE=F"
-}
-    
     with st.expander("🛢️ Select Commodities"):
         selected_commodities = st.multiselect(
             "Choose commodities to analyze:",
@@ -475,50 +365,8 @@ if page == "Commodity":
             default=list(commodity_tickers.keys())[:20]  # you can adjust how many to show by default
         )
 
-    rows = []
-    for name in selected_commodities:
-        ticker = commodity_tickers[name]
-        data = yf.download(ticker, period="1d", interval="1m", progress=False)
-        if data.empty:
-            continue
-
-        rsi = calculate_rsi(data)
-        sma = calculate_sma(data, window=5)
-        ema = calculate_ema(data, window=5)
-        macd, macd_signal = calculate_macd(data)
-        
-        data['RSI'] = rsi
-        data['SMA'] = sma
-        data['EMA'] = ema
-        data['MACD'] = macd
-        data['MACD Signal'] = macd_signal
-
-        signal = fast_commodity_signal(data)
-        price = float(data['Close'].dropna().iloc[-1])
-
-        rows.append({
-            "Commodity": name,
-            "Current Price": price,
-            "RSI(7)": round(float(rsi.dropna().iloc[-1]), 2),
-            "EMA(5)": round(float(ema.dropna().iloc[-1]), 2),
-            "SMA(5)": round(float(sma.dropna().iloc[-1]), 2),
-            "Signal": signal
-        })
-
-    df = pd.DataFrame(rows)
-
-    st.subheader("📊 Live Speed Trading Signals")
-
-    # Smart formatting
-    format_dict = {}
-    for col in df.columns:
-        if pd.api.types.is_numeric_dtype(df[col]):
-            if "Price" in col or "EMA" in col or "SMA" in col:
-                format_dict[col] = "£{:.2f}"
-            else:
-                format_dict[col] = "{:.2f}"
-
-    st.dataframe(df.style.format(format_dict))
+    # Only the board below re-runs on each tick; the rest of the script stays put
+    commodity_board(selected_commodities)
 
 
 # Stocks Page
@@ -530,12 +378,15 @@ elif page == "Stocks":
     selected_names = st.multiselect("🔍 Select companies to track:", options=list(company_dict.keys()), default=list(company_dict.keys())[:10])
     companies = [company_dict[name] for name in selected_names]
     capital = st.number_input("💰 Enter your starting capital (£):", min_value=1, value=500)
+    col1, col2 = st.columns(2)
+    max_position = col1.slider("📏 Max per position (%)", 5, 100, 25)
+    risk_horizon = col2.slider("⏱ Risk horizon (days)", 1, 60, 20)
 
+    # Fetch everything first so the Buys can be sized together
+    stock_data, signals, prices, closes = {}, {}, {}, {}
     for ticker in companies:
-        st.subheader(f"📊 Stock: {ticker}")
         data = yf.download(ticker, period="60d", interval="1d")
         if data.empty:
-            st.warning("⚠️ Error fetching data.")
             continue
 
         data['RSI'] = calculate_rsi(data)
@@ -543,8 +394,46 @@ elif page == "Stocks":
         data['EMA'] = calculate_ema(data)
         data['MACD'], data['MACD Signal'] = calculate_macd(data)
 
-        signal = signal_generator(data)
-        current_price = float(data['Close'].dropna().iloc[-1])
+        stock_data[ticker] = data
+        signals[ticker] = signal_generator(data)
+        prices[ticker] = float(data['Close'].dropna().iloc[-1])
+        closes[ticker] = pd.DataFrame(data['Close']).iloc[:, 0]
+
+    returns = pd.DataFrame(closes).sort_index().pct_change().iloc[1:]
+    book = allocate(signals, prices, returns, capital, max_position=max_position / 100)
+
+    st.subheader("💼 Proposed Portfolio")
+    if book.empty:
+        st.write("⏸ No Buy signals – nothing to allocate.")
+    else:
+        st.dataframe(book.assign(Weight=book['Weight'] * 100), column_config=BOOK_COLUMNS, hide_index=True)
+        # Risk uses years of history, not the 60-day indicator window, so the
+        # horizon is a small fraction of the sample being resampled
+        risk_returns = load_risk_returns(tuple(book['Ticker'])).reindex(columns=book['Ticker'])
+        risk_returns = risk_returns.dropna(how="all")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("📦 Invested", f"£{book['Position (£)'].sum():.2f}")
+        if len(risk_returns) < 5 * risk_horizon:
+            st.warning(f"⚠️ Only {len(risk_returns)} days of return history – not enough to estimate {risk_horizon}-day risk.")
+        else:
+            risk = simulate(risk_returns.to_numpy(), book['Weight'].to_numpy(), capital,
+                            horizon=risk_horizon, paths=10000)
+            col2.metric(f"⚠️ VaR 95% ({risk_horizon}d)", f"£{risk['VaR 95%']:.2f}")
+            col3.metric(f"🔥 CVaR 95% ({risk_horizon}d)", f"£{risk['CVaR 95%']:.2f}")
+            col4.metric("📉 Max Drawdown (p95)", f"{risk['95th pct Max Drawdown']:.1%}")
+            st.caption(f"Bootstrapped from {len(risk_returns)} daily returns, "
+                       f"{risk_returns.index[0]:%Y-%m-%d} to {risk_returns.index[-1]:%Y-%m-%d}")
+    positions = book.set_index('Ticker') if not book.empty else pd.DataFrame()
+
+    for ticker in companies:
+        st.subheader(f"📊 Stock: {ticker}")
+        if ticker not in stock_data:
+            st.warning("⚠️ Error fetching data.")
+            continue
+
+        data = stock_data[ticker]
+        signal = signals[ticker]
+        current_price = prices[ticker]
 
         col1, col2, col3, col4, col5 = st.columns(5)
         col1.metric("💵 Current Price", f"${current_price:.2f}")
@@ -553,10 +442,12 @@ elif page == "Stocks":
         col4.metric("⚡ EMA(20)", f"${data['EMA'].iloc[-1]:.2f}")
         col5.markdown(f"📌 **Signal:** {signal}")
 
-        if signal == "Buy":
-            position_size = capital * 0.25
-            quantity = position_size / current_price
+        if signal == "Buy" and ticker in positions.index:
+            position_size = positions.loc[ticker, 'Position (£)']
+            quantity = positions.loc[ticker, 'Quantity']
             st.info(f"🛍 Suggested Buy: £{position_size:.2f} (~{quantity:.2f} shares)")
+        elif signal == "Buy":
+            st.info("🛍 Buy signal, but not enough history to size a position.")
         elif signal == "Sell":
             st.warning("📤 Consider selling your position.")
         else:
@@ -684,7 +575,7 @@ elif page == "Summary":
             "EMA(20)": data['EMA'].iloc[-1],
             "Signal": signal
         })
-    stock_df = pd.DataFrame(stock_rows)
+    stock_df = as_numeric(pd.DataFrame(stock_rows), SUMMARY_COLUMNS)
 
     # --- Select Cryptocurrencies ---
     with st.expander("🔍 Select cryptocurrencies for summary (click to expand)"):
@@ -716,7 +607,7 @@ elif page == "Summary":
             "EMA(20)": df['EMA'].iloc[-1],
             "Signal": signal
         })
-    crypto_df = pd.DataFrame(crypto_rows)
+    crypto_df = as_numeric(pd.DataFrame(crypto_rows), SUMMARY_COLUMNS)
 
     # --- Signal Summary ---
     st.subheader("🔔 Signal Summary")
@@ -739,17 +630,72 @@ elif page == "Summary":
 
     # --- Detailed DataFrames inside expanders ---
     with st.expander("📈 Stocks Overview (detailed)"):
-        st.dataframe(stock_df.style.format({
-            "Current Price": safe_currency_format,
-            "RSI": safe_float_format,
-            "SMA(20)": safe_currency_format,
-            "EMA(20)": safe_currency_format,
-        }))
+        st.dataframe(stock_df, column_config=SUMMARY_COLUMNS, hide_index=True)
 
     with st.expander("🪙 Crypto Overview (detailed)"):
-        st.dataframe(crypto_df.style.format({
-            "Current Price": safe_currency_format,
-            "RSI": safe_float_format,
-            "SMA(20)": safe_currency_format,
-            "EMA(20)": safe_currency_format,
-        }))
+        st.dataframe(crypto_df, column_config=SUMMARY_COLUMNS, hide_index=True)
+
+# Pairs Page: correlated and diverging pairs across stocks, commodities and crypto
+elif page == "Pairs":
+    st.title("Cross-Asset Pairs")
+
+    with st.expander("🔍 Select universe (click to expand)"):
+        include_stocks = st.checkbox("Stocks", value=True)
+        include_commodities = st.checkbox("Commodities", value=True)
+        include_crypto = st.checkbox("Crypto", value=True)
+        # Returns follow the stock/futures calendar whenever one is selected
+        unit = "trading days" if include_stocks or include_commodities else "days"
+        col1, col2, col3 = st.columns(3)
+        long_window = col1.slider(f"Long window ({unit})", 60, 250, 120)
+        short_window = col2.slider(f"Short window ({unit})", 5, 60, 20)
+        top_n = col3.number_input("Pairs to show", min_value=5, max_value=100, value=20)
+
+    tickers = []
+    if include_stocks:
+        tickers += list(dict.fromkeys(company_dict.values()))
+    if include_commodities:
+        tickers += list(commodity_tickers.values())
+    coin_names = list(crypto_dict.keys()) if include_crypto else []
+
+    panel, dropped = load_close_panel(tuple(tickers), tuple(coin_names))
+    ticker_to_label = {v: k for k, v in commodity_tickers.items()}
+    panel = panel.rename(columns=ticker_to_label)
+    universe = [ticker_to_label.get(t, t) for t in tickers] + coin_names
+    if dropped:
+        names = ", ".join(ticker_to_label.get(name, name) for name in dropped)
+        st.warning(f"⚠️ No price history for {len(dropped)} symbols (treated as flat): {names}")
+
+    if panel.shape[1] < 2:
+        st.warning("⚠️ Not enough price history to compare.")
+        st.stop()
+
+    # Sample crypto on exchange trading days so weekend moves compound into
+    # Monday's return rather than pairing with a zero stock return
+    exchange_cols = [col for col in panel.columns if col not in coin_names]
+    calendar = panel[exchange_cols].dropna(how="all").index if exchange_cols else None
+    # Symbols that failed to download count as zero returns, so they simply
+    # drop out of the rankings without changing the scanner's shape
+    returns = aligned_returns(panel, calendar=calendar).reindex(columns=universe, fill_value=0.0)
+    state = get_pair_scanner(tuple(universe), long_window, short_window)
+    with state["lock"]:
+        complete = returns.iloc[:-1]  # the latest bar may still be forming
+        if state["fed_until"] is not None:
+            complete = complete[complete.index > state["fed_until"]]
+        if not complete.empty:
+            state["scanner"].update(complete)
+            state["fed_until"] = complete.index[-1]
+        diverging = state["scanner"].diverging(k=top_n)
+        correlated = state["scanner"].correlated(k=top_n)
+        fed_until = state["fed_until"]
+
+    st.caption(
+        f"{panel.shape[1]} symbols, {len(returns)} aligned returns ({unit}), "
+        f"{len(complete)} new this refresh, complete bars up to {fed_until:%Y-%m-%d}"
+        if fed_until is not None else f"{panel.shape[1]} symbols, no complete bars yet"
+    )
+
+    st.subheader("↔️ Top Diverging Pairs")
+    st.dataframe(diverging, column_config=PAIR_COLUMNS, hide_index=True)
+
+    st.subheader("🔗 Most Correlated Pairs")
+    st.dataframe(correlated, column_config=PAIR_COLUMNS, hide_index=True)
@@ -0,0 +1,298 @@
+# ----- Tracked universe -----
+# Shared by the Streamlit app and the offline tools (warehouse backfill etc.)
+
+company_dict = {
+    # Tech & IT
+    "Apple (AAPL)": "AAPL",
+    "Tesla (TSLA)": "TSLA",
+    "Microsoft (MSFT)": "MSFT",
+    "Google (GOOGL)": "GOOGL",
+    "Amazon (AMZN)": "AMZN",
+    "NVIDIA (NVDA)": "NVDA",
+    "Meta (META)": "META",
+    "Netflix (NFLX)": "NFLX",
+    "AMD (AMD)": "AMD",
+    "PayPal (PYPL)": "PYPL",
+    "Visa (V)": "V",
+    "Mastercard (MA)": "MA",
+    "Intel (INTC)": "INTC",
+    "Salesforce (CRM)": "CRM",
+    "Adobe (ADBE)": "ADBE",
+    "Oracle (ORCL)": "ORCL",
+    "Cisco (CSCO)": "CSCO",
+    "Qualcomm (QCOM)": "QCOM",
+    "IBM (IBM)": "IBM",
+    "Snap (SNAP)": "SNAP",
+    "eBay (EBAY)": "EBAY",
+    "Twitter (TWTR)": "TWTR",
+    "Zoom (ZM)": "ZM",
+    "Shopify (SHOP)": "SHOP",
+    "Snowflake (SNOW)": "SNOW",
+    "Palantir (PLTR)": "PLTR",
+    "Dropbox (DBX)": "DBX",
+    
+    # Consumer Goods
+    "Coca-Cola (KO)": "KO",
+    "PepsiCo (PEP)": "PEP",
+    "Procter & Gamble (PG)": "PG",
+    "McDonald's (MCD)": "MCD",
+    "Nike (NKE)": "NKE",
+    "Starbucks (SBUX)": "SBUX",
+    "Costco (COST)": "COST",
+    "Colgate-Palmolive (CL)": "CL",
+    "Mondelez (MDLZ)": "MDLZ",
+    "Kraft Heinz (KHC)": "KHC",
+    "General Mills (GIS)": "GIS",
+    "L'Oreal (OR)": "OR",
+    "Unilever (UL)": "UL",
+    "Nestle (NSRGY)": "NSRGY",
+    "Kimberly-Clark (KMB)": "KMB",
+    "Estee Lauder (EL)": "EL",
+    
+    # Finance & Banks
+    "JPMorgan Chase (JPM)": "JPM",
+    "Goldman Sachs (GS)": "GS",
+    "Morgan Stanley (MS)": "MS",
+    "Bank of America (BAC)": "BAC",
+    "Citigroup (C)": "C",
+    "Wells Fargo (WFC)": "WFC",
+    "American Express (AXP)": "AXP",
+    "Visa (V)": "V",
+    "Mastercard (MA)": "MA",
+    "Charles Schwab (SCHW)": "SCHW",
+    
+    # Healthcare & Pharma
+    "Johnson & Johnson (JNJ)": "JNJ",
+    "AbbVie (ABBV)": "ABBV",
+    "Pfizer (PFE)": "PFE",
+    "Merck (MRK)": "MRK",
+    "Moderna (MRNA)": "MRNA",
+    "Gilead Sciences (GILD)": "GILD",
+    "Bristol-Myers Squibb (BMY)": "BMY",
+    "Eli Lilly (LLY)": "LLY",
+    "Amgen (AMGN)": "AMGN",
+    "Biogen (BIIB)": "BIIB",
+    
+    # Energy & Industrials
+    "ExxonMobil (XOM)": "XOM",
+    "Chevron (CVX)": "CVX",
+    "ConocoPhillips (COP)": "COP",
+    "Schlumberger (SLB)": "SLB",
+    "Boeing (BA)": "BA",
+    "Caterpillar (CAT)": "CAT",
+    "3M (MMM)": "MMM",
+    "Honeywell (HON)": "HON",
+    "General Electric (GE)": "GE",
+    "Lockheed Martin (LMT)": "LMT",
+    "Raytheon (RTX)": "RTX",
+    "FedEx (FDX)": "FDX",
+    "United Parcel Service (UPS)": "UPS",
+    
+    # Telecom
+    "Verizon (VZ)": "VZ",
+    "AT&T (T)": "T",
+    "T-Mobile (TMUS)": "TMUS",
+    
+    # Retail
+    "Walmart (WMT)": "WMT",
+    "Target (TGT)": "TGT",
+    "Lowe's (LOW)": "LOW",
+    "Home Depot (HD)": "HD",
+    "Dollar General (DG)": "DG",
+    
+    # Automotive
+    "Ford (F)": "F",
+    "General Motors (GM)": "GM",
+    "Toyota (TM)": "TM",
+    "Honda (HMC)": "HMC",
+    "Tesla (TSLA)": "TSLA",
+    
+    # Others & Misc
+    "Disney (DIS)": "DIS",
+    "Booking Holdings (BKNG)": "BKNG",
+    "Airbnb (ABNB)": "ABNB",
+    "Uber (UBER)": "UBER",
+    "Lyft (LYFT)": "LYFT",
+    "Netflix (NFLX)": "NFLX",
+    "Spotify (SPOT)": "SPOT",
+    "Zoom Video (ZM)": "ZM",
+    "Slack (WORK)": "WORK",
+    "Intel (INTC)": "INTC",
+    
+    # International Large Caps
+    "Samsung (005930.KS)": "005930.KS",
+    "Alibaba (BABA)": "BABA",
+    "BHP Group (BHP)": "BHP",
+    "Toyota (TM)": "TM",
+    "Shell (SHEL)": "SHEL",
+    "Siemens (SIE.DE)": "SIE.DE",
+    "Nestle (NSRGY)": "NSRGY",
+    "Novartis (NVS)": "NVS",
+    "Roche (RHHBY)": "RHHBY",
+    "Sony (SONY)": "SONY",
+    
+    # Additional Popular US Stocks
+    "Twitter (TWTR)": "TWTR",
+    "Square (SQ)": "SQ",
+    "Intel (INTC)": "INTC",
+    "Dropbox (DBX)": "DBX",
+    "eBay (EBAY)": "EBAY",
+    "Zillow (Z)": "Z",
+    "Peloton (PTON)": "PTON",
+    "Wayfair (W)": "W",
+    "Xilinx (XLNX)": "XLNX",
+    "Western Digital (WDC)": "WDC",
+    
+    # More Big Names
+    "Twitter (TWTR)": "TWTR",
+    "Facebook (META)": "META",
+    "Zoom Video (ZM)": "ZM",
+    "Slack (WORK)": "WORK",
+    "Pinterest (PINS)": "PINS",
+    "Square (SQ)": "SQ",
+    "Shopify (SHOP)": "SHOP",
+    "Atlassian (TEAM)": "TEAM",
+    "DocuSign (DOCU)": "DOCU",
+    "CrowdStrike (CRWD)": "CRWD",
+
+    # Additional Tech & IT
+    "ZoomInfo Technologies (ZI)": "ZI",
+    "Snowflake Inc. (SNOW)": "SNOW",
+    "Datadog (DDOG)": "DDOG",
+    "Twilio (TWLO)": "TWLO",
+    "Workday (WDAY)": "WDAY",
+    "ServiceNow (NOW)": "NOW",
+    "CrowdStrike (CRWD)": "CRWD",
+    "Okta (OKTA)": "OKTA",
+    "Atlassian (TEAM)": "TEAM",
+
+    # More Consumer Goods
+    "Clorox (CLX)": "CLX",
+    "Church & Dwight (CHD)": "CHD",
+    "Dollar Tree (DLTR)": "DLTR",
+    "Hasbro (HAS)": "HAS",
+
+    # More Finance & Banks
+    "BlackRock (BLK)": "BLK",
+    "Visa Europe (V)": "V",
+    "American International Group (AIG)": "AIG",
+    "CME Group (CME)": "CME",
+
+    # More Healthcare & Pharma
+    "Regeneron Pharmaceuticals (REGN)": "REGN",
+    "Vertex Pharmaceuticals (VRTX)": "VRTX",
+    "Novo Nordisk (NVO)": "NVO",
+    "Sanofi (SNY)": "SNY",
+
+    # Energy & Industrials
+    "NextEra Energy (NEE)": "NEE",
+    "Dominion Energy (D)": "D",
+    "Deere & Company (DE)": "DE",
+    "Eaton Corporation (ETN)": "ETN",
+    "Tesla (TSLA)": "TSLA",
+
+    # Telecom & Media
+    "Comcast (CMCSA)": "CMCSA",
+    "Charter Communications (CHTR)": "CHTR",
+    "Spotify (SPOT)": "SPOT",
+
+    # International
+    "Tencent Holdings (0700.HK)": "0700.HK",
+    "Baidu (BIDU)": "BIDU",
+    "SAP (SAP)": "SAP",
+    "Volkswagen (VWAGY)": "VWAGY",
+    "LVMH (LVMUY)": "LVMUY",
+
+    # Consumer Services / Travel
+    "Expedia Group (EXPE)": "EXPE",
+    "Carnival Corporation (CCL)": "CCL",
+    "Marriott International (MAR)": "MAR",
+
+    # Real Estate & REITs
+    "Prologis (PLD)": "PLD",
+    "American Tower (AMT)": "AMT",
+    "Digital Realty (DLR)": "DLR",
+
+    # Others
+    "Adobe (ADBE)": "ADBE",
+    "NVIDIA (NVDA)": "NVDA",
+    "Micron Technology (MU)": "MU",
+    "Square (SQ)": "SQ",
+    "Pinterest (PINS)": "PINS",
+    
+}
+
+# Expanded Crypto Dictionary (50 popular cryptocurrencies)
+crypto_dict = {
+    "Bitcoin": "bitcoin",
+    "Ethereum": "ethereum",
+    "Binance Coin": "binancecoin",
+    "Cardano": "cardano",
+    "Dogecoin": "dogecoin",
+    "Solana": "solana",
+    "Polkadot": "polkadot",
+    "Ripple": "ripple",
+    "Litecoin": "litecoin",
+    "Avalanche": "avalanche-2",
+    "Shiba Inu": "shiba-inu",
+    "Chainlink": "chainlink",
+    "Polygon": "matic-network",
+    "Stellar": "stellar",
+    "VeChain": "vechain",
+    "Tron": "tron",
+    "EOS": "eos",
+    "Monero": "monero",
+    "Algorand": "algorand",
+    "Tezos": "tezos",
+    "Cosmos": "cosmos",
+    "Filecoin": "filecoin",
+    "Bitcoin Cash": "bitcoin-cash",
+    "NEO": "neo",
+    "IOTA": "iota",
+    "Dash": "dash",
+    "Zcash": "zcash",
+    "Maker": "maker",
+    "Kusama": "kusama",
+    "Theta Network": "theta-token",
+    "Elrond": "elrond-erd-2",
+    "Compound": "compound-governance-token",
+    "Aave": "aave",
+    "SushiSwap": "sushi",
+    "Yearn Finance": "yearn-finance",
+    "Terra": "terra-luna",
+    "Fantom": "fantom",
+    "Harmony": "harmony",
+    "Hedera": "hedera-hashgraph",
+    "Celo": "celo",
+    "Enjin Coin": "enjincoin",
+    "Basic Attention Token": "basic-attention-token",
+    "Decentraland": "decentraland",
+    "The Graph": "the-graph",
+    "Loopring": "loopring",
+    "Bitcoin SV": "bitcoin-cash-sv",
+    "Qtum": "qtum",
+    "Zilliqa": "zilliqa",
+    "Waves": "waves"
+}
+
+# Futures tickers used by the Commodity (speed trading) page
+commodity_tickers = {
+    "Gold (XAU/USD)": "GC=F",
+    "Silver (XAG/USD)": "SI=F",
+    "Crude Oil (WTI)": "CL=F",
+    "Brent Oil": "BZ=F",
+    "Natural Gas": "NG=F",
+    "Platinum": "PL=F",
+    "Copper": "HG=F",
+    "Heating Oil": "HO=F",
+    "Gasoline (RBOB)": "RB=F",
+    "Soybeans": "ZS=F",
+    "Corn": "ZC=F",
+    "Wheat": "ZW=F",
+    "Cotton": "CT=F",
+    "Coffee": "KC=F",
+    "Sugar": "SB=F",
+    "Cocoa": "CC=F",
+    "Live Cattle": "LE=F",
+    "Lean Hogs": "HE=F"
+}
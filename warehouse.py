@@ -0,0 +1,235 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import yfinance as yf
+
+from universe import company_dict, commodity_tickers
+
+# ----- Long-history bar warehouse -----
+# Layout: <root>/<interval>/symbol=<SYMBOL>/month=<YYYY-MM>.arrow
+# Each partition is an uncompressed Arrow IPC file sorted by Date, so reads can
+# memory-map it and slice the requested range without copying the bars.
+# Prices are split/dividend adjusted (auto_adjust=True), the same basis as the
+# app's own yf.download calls, so studies and the live rules see one series.
+
+DEFAULT_ROOT = os.environ.get("TRADING_WAREHOUSE", "warehouse")
+BAR_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+PRICE_BASIS = b"adjusted"
+BAR_SCHEMA = pa.schema(
+    [("Date", pa.timestamp("ns"))] + [(col, pa.float64()) for col in BAR_COLUMNS],
+    metadata={b"price_basis": PRICE_BASIS},
+)
+
+# yfinance only serves 1m bars for the last ~30 days, 7 days per request
+INTRADAY_CHUNK_DAYS = 7
+BATCH_SIZE = 50
+
+
+def registry_symbols():
+    # Stocks and commodity futures, deduplicated (company_dict repeats some tickers)
+    symbols = list(company_dict.values()) + list(commodity_tickers.values())
+    return list(dict.fromkeys(symbols))
+
+
+def _symbol_dir(root, interval, symbol):
+    # "/" is legal in some tickers but not in a directory name
+    safe = symbol.replace("/", "_")
+    return os.path.join(root, interval, f"symbol={safe}")
+
+
+def _partition_path(root, interval, symbol, month):
+    return os.path.join(_symbol_dir(root, interval, symbol), f"month={month}.arrow")
+
+
+def _normalize_bars(df):
+    # Flatten a single-ticker yfinance frame into the warehouse schema
+    if df is None or df.empty:
+        return pd.DataFrame(columns=["Date"] + BAR_COLUMNS)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.droplevel(-1, axis=1) if "Close" in df.columns.get_level_values(0) else df.droplevel(0, axis=1)
+    df = df[[col for col in BAR_COLUMNS if col in df.columns]].copy()
+    for col in BAR_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    index = pd.DatetimeIndex(df.index)
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+    df.index = index.astype("datetime64[ns]")
+    df.index.name = "Date"
+    df = df.dropna(subset=["Close"]).astype("float64")
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return df.reset_index()[["Date"] + BAR_COLUMNS]
+
+
+def _split_download(data, symbols):
+    # yf.download returns ticker-grouped columns for batches; split them back out
+    frames = {}
+    if data is None or data.empty:
+        return frames
+    if isinstance(data.columns, pd.MultiIndex):
+        available = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol in available:
+                frames[symbol] = _normalize_bars(data[symbol])
+    elif len(symbols) == 1:
+        frames[symbols[0]] = _normalize_bars(data)
+    return frames
+
+
+def _naive_utc(ts):
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert("UTC").tz_localize(None) if ts.tz is not None else ts
+
+
+def _read_partition(path):
+    # Zero-copy: the returned table's buffers point into the mapped file.
+    # Partitions from before prices were stored adjusted read as None.
+    source = pa.memory_map(path, "r")
+    table = ipc.open_file(source).read_all()
+    if (table.schema.metadata or {}).get(b"price_basis") != PRICE_BASIS:
+        return None
+    return table
+
+
+def _write_partition(path, df):
+    table = pa.Table.from_pandas(df, schema=BAR_SCHEMA, preserve_index=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with ipc.new_file(sink, BAR_SCHEMA) as writer:
+            writer.write_table(table, max_chunksize=len(table) or None)
+    # Atomic swap so concurrent readers never map a half-written file
+    os.replace(tmp_path, path)
+
+
+def write_bars(symbol, bars, interval="1d", root=DEFAULT_ROOT):
+    # Merge bars into the symbol's monthly partitions; returns rows written
+    bars = _normalize_bars(bars.set_index("Date")) if "Date" in bars.columns else _normalize_bars(bars)
+    if bars.empty:
+        return 0
+
+    months = bars["Date"].dt.strftime("%Y-%m")
+    for month, chunk in bars.groupby(months, sort=False):
+        path = _partition_path(root, interval, symbol, month)
+        existing = _read_partition(path) if os.path.exists(path) else None
+        if existing is not None:
+            # Rows on the old basis (None above) are overwritten, never merged
+            existing = existing.to_pandas()
+            chunk = pd.concat([existing, chunk], ignore_index=True)
+            chunk = chunk.drop_duplicates(subset="Date", keep="last").sort_values("Date")
+        _write_partition(path, chunk.reset_index(drop=True))
+    return len(bars)
+
+
+def backfill(symbols=None, years=5, intraday_weeks=4, root=DEFAULT_ROOT, pause=1.0):
+    symbols = symbols or registry_symbols()
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None).normalize() + pd.Timedelta(days=1)
+    daily_start = now - pd.DateOffset(years=years)
+    summary = {"1d": 0, "1m": 0}
+
+    for i in range(0, len(symbols), BATCH_SIZE):
+        batch = symbols[i:i + BATCH_SIZE]
+
+        if years:
+            data = yf.download(batch, start=daily_start, end=now, interval="1d",
+                               group_by="ticker", auto_adjust=True, progress=False, threads=True)
+            for symbol, bars in _split_download(data, batch).items():
+                summary["1d"] += write_bars(symbol, bars, interval="1d", root=root)
+            time.sleep(pause)
+
+        if intraday_weeks:
+            intraday_start = now - pd.Timedelta(weeks=intraday_weeks)
+            chunk_start = intraday_start
+            while chunk_start < now:
+                chunk_end = min(chunk_start + pd.Timedelta(days=INTRADAY_CHUNK_DAYS), now)
+                data = yf.download(batch, start=chunk_start, end=chunk_end, interval="1m",
+                                   group_by="ticker", auto_adjust=True, progress=False, threads=True)
+                for symbol, bars in _split_download(data, batch).items():
+                    summary["1m"] += write_bars(symbol, bars, interval="1m", root=root)
+                chunk_start = chunk_end
+                time.sleep(pause)
+
+    return summary
+
+
+def list_symbols(interval="1d", root=DEFAULT_ROOT):
+    base = os.path.join(root, interval)
+    if not os.path.isdir(base):
+        return []
+    return sorted(name[len("symbol="):] for name in os.listdir(base) if name.startswith("symbol="))
+
+
+def read_bars(symbols, start=None, end=None, interval="1d", root=DEFAULT_ROOT, columns=None):
+    # Returns {symbol: pyarrow.Table} restricted to start <= Date < end.
+    # Tables are slices of memory-mapped partitions, so nothing is loaded into
+    # RAM until a column is actually touched (e.g. by .to_pandas()).
+    if isinstance(symbols, str):
+        symbols = [symbols]
+    start = _naive_utc(start) if start is not None else pd.Timestamp("1970-01-01")
+    end = _naive_utc(end) if end is not None else pd.Timestamp.now().normalize() + pd.Timedelta(days=1)
+    first_month, last_month = start.strftime("%Y-%m"), end.strftime("%Y-%m")
+    lo_key = np.datetime64(start, "ns")
+    hi_key = np.datetime64(end, "ns")
+
+    result = {}
+    for symbol in symbols:
+        symbol_dir = _symbol_dir(root, interval, symbol)
+        if not os.path.isdir(symbol_dir):
+            continue
+        # Partition pruning: month names sort chronologically
+        months = sorted(
+            name[len("month="):-len(".arrow")] for name in os.listdir(symbol_dir)
+            if name.startswith("month=") and name.endswith(".arrow")
+        )
+        pieces = []
+        for month in months:
+            if month < first_month or month > last_month:
+                continue
+            path = _partition_path(root, interval, symbol, month)
+            table = _read_partition(path)
+            if table is None:
+                continue  # unadjusted partition from an old backfill; re-run it
+            if columns is not None:
+                table = table.select(["Date"] + [col for col in columns if col != "Date"])
+            dates = table.column("Date").to_numpy()
+            lo = int(np.searchsorted(dates, lo_key, side="left"))
+            hi = int(np.searchsorted(dates, hi_key, side="left"))
+            if hi > lo:
+                pieces.append(table.slice(lo, hi - lo))
+        if pieces:
+            result[symbol] = pa.concat_tables(pieces)
+    return result
+
+
+def read_close_panel(symbols, start=None, end=None, interval="1d", root=DEFAULT_ROOT):
+    # Wide Date x Symbol frame of closes; only the Close column is materialized
+    tables = read_bars(symbols, start, end, interval=interval, root=root, columns=["Close"])
+    series = {}
+    for symbol, table in tables.items():
+        dates = pd.DatetimeIndex(table.column("Date").to_numpy(), name="Date")
+        series[symbol] = pd.Series(table.column("Close").to_numpy(), index=dates)
+    if not series:
+        return pd.DataFrame()
+    return pd.DataFrame(series).sort_index()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill the long-history bar warehouse.")
+    parser.add_argument("symbols", nargs="*", help="Tickers to backfill (default: whole registry)")
+    parser.add_argument("--root", default=DEFAULT_ROOT, help="Warehouse directory")
+    parser.add_argument("--years", type=int, default=5, help="Years of daily bars (0 to skip)")
+    parser.add_argument("--intraday-weeks", type=int, default=4, help="Weeks of 1m bars (0 to skip, max ~4)")
+    args = parser.parse_args()
+
+    summary = backfill(args.symbols or None, years=args.years,
+                       intraday_weeks=args.intraday_weeks, root=args.root)
+    print(f"Wrote {summary['1d']} daily and {summary['1m']} intraday bars to {args.root}")
+
+
+if __name__ == "__main__":
+    main()